@@ -1,165 +1,312 @@
+import functools
 import json
+import mmap
+import re
 import yaml
 from docx import Document
-from docx.shared import Inches, Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
-from typing import Dict, List, Any
+from docx.oxml import parse_xml
+from docx.oxml.ns import nsdecls
+from docx.shared import Emu
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping
+from collections import OrderedDict
+from xml.sax.saxutils import escape
 import os
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    def _json_loads(data) -> Any:
+        """Parse JSON from a bytes-like object with the stdlib parser."""
+        return json.loads(bytes(data))
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+_SAVE_BUFFER_SIZE = 1 << 20
+_TEMPLATE_CACHE_SIZE = 100
+_TEMPLATE_CACHE: 'OrderedDict[str, tuple]' = OrderedDict()
+
+# Raw WordprocessingML fragments used to emit titles and tables without going through
+# python-docx's object model. Run content is built by _run_xml.
+_BOLD_RPR_XML = '<w:rPr><w:b/></w:rPr>'
+_EMPTY_P_XML = '<w:p %s/>' % nsdecls('w')
+_TITLE_P_TMPL = (
+    '<w:p %s>' % nsdecls('w')
+    + '<w:pPr><w:pStyle w:val="{style_id}"/><w:jc w:val="center"/></w:pPr>'
+    '<w:r>{content}</w:r></w:p>'
+)
+_BOLD_P_TMPL = (
+    '<w:p %s><w:r>' % nsdecls('w') + _BOLD_RPR_XML
+    + '{content}</w:r></w:p>'
+)
+_TBL_TMPL = (
+    '<w:tbl %s>' % nsdecls('w')
+    + '<w:tblPr><w:tblStyle w:val="{style_id}"/><w:tblW w:type="auto" w:w="0"/>'
+    '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0"'
+    ' w:noHBand="0" w:noVBand="1" w:val="04A0"/></w:tblPr>'
+    '<w:tblGrid>{grid}</w:tblGrid>{rows}</w:tbl>'
+)
+_T_TMPL = '<w:t xml:space="preserve">{text}</w:t>'
+_RUN_BREAK_XML = {'\t': '<w:tab/>', '\n': '<w:br/>', '\r': '<w:br/>'}
+_RUN_BREAK_RE = re.compile(r'([\t\n\r])')
+_GRID_COL_TMPL = '<w:gridCol w:w="{width}"/>'
+_ROW_TMPL = '<w:tr>{cells}</w:tr>'
+_CELL_TMPL = (
+    '<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{width}"/></w:tcPr>'
+    '<w:p><w:r>{rpr}{content}</w:r></w:p></w:tc>'
+)
+
+
+def _load_templates(template_file: str) -> Mapping:
+    """Load the YAML templates, reusing a cached parse while the file is unchanged.
+
+    The cached dict is shared between generators and returned behind a
+    read-only proxy; callers must not mutate the nested template dicts.
+    """
+    path = os.path.abspath(template_file)
+    st = os.stat(path)
+    cached = _TEMPLATE_CACHE.get(path)
+    if cached is not None and cached[0] == st.st_mtime and cached[1] == st.st_size:
+        _TEMPLATE_CACHE.move_to_end(path)
+        return MappingProxyType(cached[2])
+
+    with open(path, 'r') as f:
+        templates = yaml.load(f, Loader=_YamlLoader)
+    _TEMPLATE_CACHE[path] = (st.st_mtime, st.st_size, templates)
+    _TEMPLATE_CACHE.move_to_end(path)
+    if len(_TEMPLATE_CACHE) > _TEMPLATE_CACHE_SIZE:
+        _TEMPLATE_CACHE.popitem(last=False)
+    return MappingProxyType(templates)
+
+
+def _run_xml(text: str) -> str:
+    """Return escaped run content for text, mapping tabs and line breaks like python-docx."""
+    if not _RUN_BREAK_RE.search(text):
+        return _T_TMPL.format(text=escape(text)) if text else ''
+    return ''.join(
+        _RUN_BREAK_XML[part] if part in _RUN_BREAK_XML else _T_TMPL.format(text=escape(part))
+        for part in _RUN_BREAK_RE.split(text) if part
+    )
+
+
+def _to_text(value: Any) -> str:
+    """Return value as a string, skipping the str() call for exact strings."""
+    return value if type(value) is str else str(value)
+
+
+@functools.lru_cache(maxsize=256)
+def _pretty_key(key: str) -> str:
+    """Turn a snake_case key into a title-cased label."""
+    return key.replace('_', ' ').title()
+
+
 class DocumentGenerator:
+    """Render the objects in a JSON payload into a Word document.
+
+    Each type_* template supplies a title plus a title and headers for
+    tables 1-3. The Type B-E summary tables label their value column
+    themselves, so table3_headers is only read for type_a.
+    """
+
     def __init__(self, json_data: Dict, template_file: str = 'text_templates.yaml'):
         """Initialize the document generator with JSON data and templates."""
         self.json_data = json_data
-        with open(template_file, 'r') as f:
-            self.templates = yaml.safe_load(f)
+        self.templates = _load_templates(template_file)
         self.doc = Document()
+        self._grid_style_id = self.doc.styles['Table Grid'].style_id
+        self._heading_style_id = self.doc.styles['Heading 1'].style_id
+        self._dispatch = {
+            'TypeA': self.process_type_a,
+            'TypeB': self.process_type_b,
+            'TypeC': self.process_type_c,
+            'TypeD': self.process_type_d,
+            'TypeE': self.process_type_e,
+        }
 
     def add_title(self, text: str) -> None:
         """Add a title to the document with specific formatting."""
-        title = self.doc.add_heading(text, level=1)
-        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        self.doc.add_paragraph()
+        body = self.doc.element.body
+        body._insert_p(parse_xml(_TITLE_P_TMPL.format(
+            style_id=self._heading_style_id, content=_run_xml(text)
+        )))
+        body._insert_p(parse_xml(_EMPTY_P_XML))
 
     def add_table(self, headers: List[str], rows: List[List[str]], title: str = None) -> None:
-        """Add a table to the document with headers and rows."""
+        """Add a table to the document with headers and rows.
+
+        Every row must have exactly one value per header.
+        """
+        body = self.doc.element.body
         if title:
-            title_para = self.doc.add_paragraph()
-            title_para.add_run(title).bold = True
-        
-        table = self.doc.add_table(rows=1, cols=len(headers))
-        table.style = 'Table Grid'
-        
-        # Add headers
-        header_cells = table.rows[0].cells
-        for i, header in enumerate(headers):
-            header_cells[i].text = header
-            header_cells[i].paragraphs[0].runs[0].bold = True
+            body._insert_p(parse_xml(_BOLD_P_TMPL.format(content=_run_xml(title))))
+
+        col_width = Emu(self.doc._block_width // len(headers)).twips if headers else 0
 
-        # Add data rows
-        for row_data in rows:
-            row_cells = table.add_row().cells
-            for i, cell_data in enumerate(row_data):
-                row_cells[i].text = str(cell_data)
+        # Build the whole table as one XML string and parse it in a single pass
+        header_xml = ''.join(
+            _CELL_TMPL.format(width=col_width, rpr=_BOLD_RPR_XML, content=_run_xml(header))
+            for header in headers
+        )
+        rows_xml = [_ROW_TMPL.format(cells=header_xml)]
+        rows_xml.extend(
+            _ROW_TMPL.format(cells=''.join(
+                _CELL_TMPL.format(width=col_width, rpr='', content=_run_xml(_to_text(cell_data)))
+                for cell_data in row_data
+            ))
+            for row_data in rows
+        )
+        grid_xml = _GRID_COL_TMPL.format(width=col_width) * len(headers)
+        body._insert_tbl(parse_xml(_TBL_TMPL.format(
+            style_id=self._grid_style_id, grid=grid_xml, rows=''.join(rows_xml)
+        )))
 
-        self.doc.add_paragraph()
+        body._insert_p(parse_xml(_EMPTY_P_XML))
 
     def process_type_a(self, data: Dict) -> None:
         """Process Type A objects."""
+        if not data:
+            return
         template = self.templates['type_a']
         self.add_title(template['title'])
+        t1_headers, t1_title = template['table1_headers'], template['table1_title']
+        t2_headers, t2_title = template['table2_headers'], template['table2_title']
+        t3_headers, t3_title = template['table3_headers'], template['table3_title']
+        key_header = t1_headers[0]
         
         # Table 1: Device Information
         rows = [[item['id'], item['name'], item['description']] for item in data]
-        self.add_table(template['table1_headers'], rows, template['table1_title'])
+        self.add_table(t1_headers, rows, t1_title)
         
         # Table 2: Parameters
+        rows = []
         for item in data:
             params = item['parameters']
-            rows = [[params['status'], params['priority'], params['last_updated']]]
-            self.add_table(template['table2_headers'], rows, template['table2_title'])
+            rows.append([item['id'], params['status'], params['priority'], params['last_updated']])
+        self.add_table([key_header, *t2_headers], rows, t2_title)
         
         # Table 3: Additional Info
         rows = [["Total Devices", len(data)]]
-        self.add_table(template['table3_headers'], rows, template['table3_title'])
+        self.add_table(t3_headers, rows, t3_title)
 
     def process_type_b(self, data: Dict) -> None:
         """Process Type B objects."""
+        if not data:
+            return
         template = self.templates['type_b']
         self.add_title(template['title'])
+        t1_headers, t1_title = template['table1_headers'], template['table1_title']
+        t2_headers, t2_title = template['table2_headers'], template['table2_title']
+        t3_title = template['table3_title']
+        key_header = t1_headers[0]
         
-        for item in data:
-            # Table 1: Component Details
-            rows = [[item['component_id'], item['installation_date']]]
-            self.add_table(template['table1_headers'], rows, template['table1_title'])
-            
-            # Table 2: Technical Specs
-            specs = item['specs']
-            rows = [[k, v] for k, v in specs.items()]
-            self.add_table(template['table2_headers'], rows, template['table2_title'])
-            
-            # Table 3: Manufacturer Info
-            rows = [["Manufacturer", specs['manufacturer']]]
-            self.add_table(template['table3_headers'], rows, template['table3_title'])
+        # Table 1: Component Details
+        rows = [[item['component_id'], item['installation_date']] for item in data]
+        self.add_table(t1_headers, rows, t1_title)
+        
+        # Table 2: Technical Specs
+        rows = [[item['component_id'], k, v] for item in data for k, v in item['specs'].items()]
+        self.add_table([key_header, *t2_headers], rows, t2_title)
+        
+        # Table 3: Manufacturer Info, one summary row per component
+        rows = [[item['component_id'], item['specs']['manufacturer']] for item in data]
+        self.add_table([key_header, "Manufacturer"], rows, t3_title)
 
     def process_type_c(self, data: Dict) -> None:
         """Process Type C objects."""
+        if not data:
+            return
         template = self.templates['type_c']
         self.add_title(template['title'])
+        t1_headers, t1_title = template['table1_headers'], template['table1_title']
+        t2_headers, t2_title = template['table2_headers'], template['table2_title']
+        t3_title = template['table3_title']
+        key_header = t1_headers[0]
         
-        for item in data:
-            # Table 1: Transaction Overview
-            rows = [[item['transaction_id'], item['amount'], item['currency']]]
-            self.add_table(template['table1_headers'], rows, template['table1_title'])
-            
-            # Table 2: Party Information
-            rows = [[i+1, party] for i, party in enumerate(item['parties'])]
-            self.add_table(template['table2_headers'], rows, template['table2_title'])
-            
-            # Table 3: Status
-            rows = [["Approved", "Yes" if item['approved'] else "No"]]
-            self.add_table(template['table3_headers'], rows, template['table3_title'])
+        # Table 1: Transaction Overview
+        rows = [[item['transaction_id'], item['amount'], item['currency']] for item in data]
+        self.add_table(t1_headers, rows, t1_title)
+        
+        # Table 2: Party Information
+        rows = [[item['transaction_id'], i+1, party]
+                for item in data for i, party in enumerate(item['parties'])]
+        self.add_table([key_header, *t2_headers], rows, t2_title)
+        
+        # Table 3: Status, one summary row per transaction
+        rows = [[item['transaction_id'], "Yes" if item['approved'] else "No"]
+                for item in data]
+        self.add_table([key_header, "Approved"], rows, t3_title)
 
     def process_type_d(self, data: Dict) -> None:
         """Process Type D objects."""
+        if not data:
+            return
         template = self.templates['type_d']
         self.add_title(template['title'])
+        t1_headers, t1_title = template['table1_headers'], template['table1_title']
+        t2_headers, t2_title = template['table2_headers'], template['table2_title']
+        t3_title = template['table3_title']
+        key_header = t1_headers[0]
         
-        for item in data:
-            # Table 1: Test Information
-            rows = [[item['test_id'], item['environment']]]
-            self.add_table(template['table1_headers'], rows, template['table1_title'])
-            
-            # Table 2: Metrics
-            metrics = item['metrics']
-            rows = [[k.replace('_', ' ').title(), v] for k, v in metrics.items()]
-            self.add_table(template['table2_headers'], rows, template['table2_title'])
-            
-            # Table 3: Additional Details
-            rows = [["Environment Type", item['environment'].title()]]
-            self.add_table(template['table3_headers'], rows, template['table3_title'])
+        # Table 1: Test Information
+        rows = [[item['test_id'], item['environment']] for item in data]
+        self.add_table(t1_headers, rows, t1_title)
+        
+        # Table 2: Metrics
+        rows = [[item['test_id'], _pretty_key(k), v]
+                for item in data for k, v in item['metrics'].items()]
+        self.add_table([key_header, *t2_headers], rows, t2_title)
+        
+        # Table 3: Additional Details, one summary row per test
+        rows = [[item['test_id'], item['environment'].title()] for item in data]
+        self.add_table([key_header, "Environment Type"], rows, t3_title)
 
     def process_type_e(self, data: Dict) -> None:
         """Process Type E objects."""
+        if not data:
+            return
         template = self.templates['type_e']
         self.add_title(template['title'])
+        t1_headers, t1_title = template['table1_headers'], template['table1_title']
+        t2_headers, t2_title = template['table2_headers'], template['table2_title']
+        t3_title = template['table3_title']
+        key_header = t1_headers[0]
         
-        for item in data:
-            # Table 1: Employee Details
-            rows = [[item['employee_id'], item['department'], item['role']]]
-            self.add_table(template['table1_headers'], rows, template['table1_title'])
-            
-            # Table 2: Project Information
-            rows = [[i+1, project] for i, project in enumerate(item['projects'])]
-            self.add_table(template['table2_headers'], rows, template['table2_title'])
-            
-            # Table 3: Additional Information
-            rows = [["Total Projects", len(item['projects'])]]
-            self.add_table(template['table3_headers'], rows, template['table3_title'])
+        # Table 1: Employee Details
+        rows = [[item['employee_id'], item['department'], item['role']] for item in data]
+        self.add_table(t1_headers, rows, t1_title)
+        
+        # Table 2: Project Information
+        rows = [[item['employee_id'], i+1, project]
+                for item in data for i, project in enumerate(item['projects'])]
+        self.add_table([key_header, *t2_headers], rows, t2_title)
+        
+        # Table 3: Additional Information, one summary row per employee
+        rows = [[item['employee_id'], len(item['projects'])] for item in data]
+        self.add_table([key_header, "Total Projects"], rows, t3_title)
 
     def generate_document(self, output_file: str = 'output.docx') -> None:
         """Generate the complete Word document."""
         objects = self.json_data.get('objects', {})
         
-        # Process each type of object
-        if 'TypeA' in objects:
-            self.process_type_a(objects['TypeA'])
-        if 'TypeB' in objects:
-            self.process_type_b(objects['TypeB'])
-        if 'TypeC' in objects:
-            self.process_type_c(objects['TypeC'])
-        if 'TypeD' in objects:
-            self.process_type_d(objects['TypeD'])
-        if 'TypeE' in objects:
-            self.process_type_e(objects['TypeE'])
+        # Process each type of object in dispatch order
+        for type_name, process in self._dispatch.items():
+            if (data := objects.get(type_name)) is not None:
+                process(data)
         
-        # Save the document
-        self.doc.save(output_file)
+        # Save the document through a 1 MiB buffer to batch the zip writes
+        with open(output_file, 'wb', buffering=_SAVE_BUFFER_SIZE) as f:
+            self.doc.save(f)
 
 
 if __name__ == '__main__':
     # Read JSON data
-    with open('sample.json', 'r') as f:
-        json_data = json.load(f)
+    with open('sample.json', 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+            memoryview(mm) as view:
+        json_data = _json_loads(view)
     
     # Specify output path (you can change this to any path you want)
     output_path = 'generated_document.docx'